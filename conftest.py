@@ -0,0 +1 @@
+# Lets plain `pytest` import the example modules from the repository root.
@@ -0,0 +1,4 @@
+# LangGraph examples, one module per example:
+#   - exchange:  customer exchange-file extraction workflow.
+#   - assistant: the start/process/tool/final walkthrough from LanggraphExample.py.
+# Helpers shared between them live in common.
@@ -0,0 +1,96 @@
+# Runnable version of the assistant walkthrough in LanggraphExample.py:
+# start_node → process_node → [conditional] → tool_node → final_node
+#                                           ↘ final_node
+from typing import TypedDict
+import re
+
+from langgraph.graph import StateGraph, START, END
+
+# ------------------------------------------------------------------------------
+# State shared by the nodes. Every node returns only the keys it sets.
+# ------------------------------------------------------------------------------
+class AssistantState(TypedDict, total=False):
+    user_input: str
+    message: str
+    answer: str
+    answerok: bool
+    final_answer: str
+
+# ------------------------------------------------------------------------------
+# The starting node receives the user input and simply passes it along.
+# ------------------------------------------------------------------------------
+def start_node(state: AssistantState) -> dict:
+    return {"message": state["user_input"]}
+
+# ------------------------------------------------------------------------------
+# The processing node simulates generating an answer (in a real application
+# this could call an LLM) and flags whether it is acceptable. For
+# demonstration, the answer is not acceptable if the message contains one of
+# REJECT_KEYWORDS. The keywords are compiled into one case-insensitive regex,
+# so the message is scanned once, without a lowercased copy, however many
+# keywords are added.
+# ------------------------------------------------------------------------------
+REJECT_KEYWORDS = ("bad",)
+_REJECT_RE = re.compile("|".join(map(re.escape, REJECT_KEYWORDS)), re.IGNORECASE)
+
+def process_node(state: AssistantState) -> dict:
+    answer = f"Answer for: {state['message']}"
+    answerok = _REJECT_RE.search(state["message"]) is None
+    return {"answer": answer, "answerok": answerok}
+
+# ------------------------------------------------------------------------------
+# Conditional edge: call the tool when the answer is not acceptable, otherwise
+# go straight to the final node.
+# ------------------------------------------------------------------------------
+def decide_next_node(state: AssistantState) -> str:
+    if state.get("answerok") is False:
+        return "tool_node"
+    return "final_node"
+
+# ------------------------------------------------------------------------------
+# The tool improves the answer.
+# ------------------------------------------------------------------------------
+def tool_node(state: AssistantState) -> dict:
+    return {"answer": state["answer"] + " [Improved with tool]"}
+
+# ------------------------------------------------------------------------------
+# The final node returns the answer.
+# ------------------------------------------------------------------------------
+def final_node(state: AssistantState) -> dict:
+    return {"final_answer": state["answer"]}
+
+# ------------------------------------------------------------------------------
+# Build and compile the graph.
+# ------------------------------------------------------------------------------
+def build_assistant_graph():
+    graph_builder = StateGraph(AssistantState)
+
+    graph_builder.add_node("start_node", start_node)
+    graph_builder.add_node("process_node", process_node)
+    graph_builder.add_node("tool_node", tool_node)
+    graph_builder.add_node("final_node", final_node)
+
+    graph_builder.add_edge(START, "start_node")
+    graph_builder.add_edge("start_node", "process_node")
+    graph_builder.add_conditional_edges(
+        "process_node",
+        decide_next_node,
+        {"tool_node": "tool_node", "final_node": "final_node"},
+    )
+    # If the tool was called, route its output to the final node.
+    graph_builder.add_edge("tool_node", "final_node")
+    graph_builder.add_edge("final_node", END)
+
+    return graph_builder.compile()
+
+GRAPH = build_assistant_graph()
+
+# ------------------------------------------------------------------------------
+# Example usage (python -m langgraph_examples.assistant).
+# ------------------------------------------------------------------------------
+def main() -> None:
+    print(GRAPH.invoke({"user_input": "Tell me a good answer."}))
+    print(GRAPH.invoke({"user_input": "Tell me a bad answer."}))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# Shared helpers for the LangGraph examples: prompt construction, content
+# hashing, a response LRU, and an optional local-model backend.
+from typing import Any
+from collections import OrderedDict
+import asyncio
+import atexit
+import copy
+import hashlib
+import importlib.util
+import weakref
+
+import httpx
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+from langchain_core.output_parsers import PydanticOutputParser
+from langchain_core.runnables import Runnable, RunnableLambda
+from pydantic import BaseModel
+from langchain_core.runnables.config import run_in_executor
+
+# ------------------------------------------------------------------------------
+# Prompts with a cacheable prefix.
+#
+# cached_prompt() sends the constant prefix as a system block marked with
+# cache_control "ephemeral", followed by the per-request text. Anthropic (and
+# Bedrock) then cache the prefix and only process the text on later calls;
+# providers without prompt caching ignore the marker.
+#
+# Anthropic only caches a prefix of at least 1024 tokens (2048 on Haiku) and
+# silently ignores the marker below that. The example prefixes are ~30-60
+# tokens, so they are not cached as they stand; the marker starts paying off
+# once a prefix grows past the minimum (few-shot examples, a schema, a long
+# policy text).
+# ------------------------------------------------------------------------------
+def cached_prompt(prefix: str, text: str) -> list[BaseMessage]:
+    return [
+        SystemMessage(content=[{"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}]),
+        HumanMessage(content=text),
+    ]
+
+# ------------------------------------------------------------------------------
+# Structured outputs.
+#
+# structured_llm() binds a Pydantic schema to a model, so callers get a validated
+# instance back instead of free text to re-parse. Chat models do this through
+# with_structured_output() (tool/function calling); other runnables (the
+# simulated and local models) get the schema's JSON format instructions
+# appended to the last message, and their answer is parsed against the schema
+# (JSON text through PydanticOutputParser, dicts through model_validate()).
+# ------------------------------------------------------------------------------
+def structured_llm(llm: Runnable, schema: type[BaseModel]) -> Runnable:
+    if hasattr(llm, "with_structured_output"):
+        return llm.with_structured_output(schema)
+
+    parser = PydanticOutputParser(pydantic_object=schema)
+    instructions = parser.get_format_instructions()
+
+    def add_instructions(prompt: list[BaseMessage]) -> list[BaseMessage]:
+        last = prompt[-1]
+        return [*prompt[:-1], last.model_copy(update={"content": f"{last.content}\n\n{instructions}"})]
+
+    def parse(response: Any) -> BaseModel:
+        if isinstance(response, str):
+            return parser.parse(response)
+        return schema.model_validate(response)
+
+    return RunnableLambda(add_instructions) | llm | RunnableLambda(parse)
+
+# ------------------------------------------------------------------------------
+# Response cache.
+#
+# LLM answers that are deterministic for a given prompt can be kept in an LRU
+# keyed by the prefix and a blake2b hash of the text. Async nodes are coroutines,
+# which functools.lru_cache can't memoize (a coroutine can only be awaited
+# once), hence the small OrderedDict LRU. Several workers could share the same
+# keys through Redis (SETNX on the hash key) instead.
+#
+# Entries are deep-copied on put() and on get(), so a caller that mutates the
+# dict it got back can't change what later hits return.
+# ------------------------------------------------------------------------------
+def content_hash(text: str) -> bytes:
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+class ResponseCache:
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, key: tuple, default: Any = None) -> Any:
+        if key not in self._entries:
+            return default
+        self._entries.move_to_end(key)
+        return copy.deepcopy(self._entries[key])
+
+    def put(self, key: tuple, response: Any) -> None:
+        self._entries[key] = copy.deepcopy(response)
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+# ------------------------------------------------------------------------------
+# Optional local model.
+#
+# A drop-in replacement for an example's llm that runs a HuggingFace causal LM
+# in-process:
+#   llm = LocalTransformersLLM("Qwen/Qwen2.5-0.5B-Instruct")
+# torch and transformers are only imported when it is constructed.
+#
+# A whole batch goes through one tokenizer call (left padding, so every prompt
+# ends right where generation starts) and one model.generate() call under
+# torch.inference_mode(), which skips autograd bookkeeping. transformers'
+# pipeline() is avoided on purpose: it feeds its inputs to the model one by one.
+# ------------------------------------------------------------------------------
+def _messages_to_chat(prompt: list[BaseMessage]) -> list[dict]:
+    roles = {"system": "system", "human": "user", "ai": "assistant"}
+    chat = []
+    for message in prompt:
+        content = message.content
+        if isinstance(content, list):
+            content = "".join(block["text"] for block in content if block.get("type") == "text")
+        chat.append({"role": roles.get(message.type, "user"), "content": content})
+    return chat
+
+class LocalTransformersLLM(Runnable):
+    def __init__(self, model_name: str, max_new_tokens: int = 256):
+        import torch
+        from transformers import AutoModelForCausalLM, AutoTokenizer
+
+        self._torch = torch
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name, padding_side="left")
+        if self.tokenizer.pad_token is None:
+            self.tokenizer.pad_token = self.tokenizer.eos_token
+        self.model = AutoModelForCausalLM.from_pretrained(model_name).eval()
+        self.max_new_tokens = max_new_tokens
+
+    def invoke(self, input: list[BaseMessage], config=None, **kwargs) -> str:
+        return self.batch([input], config)[0]
+
+    async def ainvoke(self, input: list[BaseMessage], config=None, **kwargs) -> str:
+        return (await self.abatch([input], config))[0]
+
+    def batch(self, inputs: list[list[BaseMessage]], config=None, *, return_exceptions: bool = False, **kwargs) -> list:
+        try:
+            texts = [
+                self.tokenizer.apply_chat_template(_messages_to_chat(prompt), tokenize=False, add_generation_prompt=True)
+                for prompt in inputs
+            ]
+            # The chat template already contains the BOS token; don't add another.
+            encoded = self.tokenizer(texts, padding=True, add_special_tokens=False, return_tensors="pt").to(self.model.device)
+            with self._torch.inference_mode():
+                output_ids = self.model.generate(**encoded, max_new_tokens=self.max_new_tokens)
+            # Keep only the generated continuation of each prompt.
+            new_tokens = output_ids[:, encoded["input_ids"].shape[1]:]
+            return self.tokenizer.batch_decode(new_tokens, skip_special_tokens=True)
+        except Exception as exc:
+            # The whole batch is one generate() call, so a failure hits every input.
+            if return_exceptions:
+                return [exc] * len(inputs)
+            raise
+
+    async def abatch(self, inputs: list[list[BaseMessage]], config=None, *, return_exceptions: bool = False, **kwargs) -> list:
+        # generate() blocks, so run the batch off the event loop.
+        return await run_in_executor(None, self.batch, inputs, return_exceptions=return_exceptions)
+
+# ------------------------------------------------------------------------------
+# Remote chat models with pooled connections.
+#
+# Every model built here shares one sync and one async HTTP client, so repeated
+# calls reuse kept-alive connections instead of paying a new TCP/TLS handshake
+# each time. HTTP/2 multiplexing is turned on when the h2 package
+# (httpx[http2]) is installed. Use the same clients for any other remote model
+# you wire in:
+#   llm = build_openai_llm()
+# The clients are only created by the first build, and langchain_openai is only
+# imported then, so importing an example opens no connections.
+#
+# An asyncio connection is tied to the event loop that opened it, so the async
+# client keeps one connection pool per running loop (_PerLoopTransport) and a
+# model can be used from successive asyncio.run() calls. Awaiting the client's
+# aclose() closes the current loop's pool; the sync client is closed at exit.
+# ------------------------------------------------------------------------------
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=100, max_connections=200)
+_HTTP2 = importlib.util.find_spec("h2") is not None
+
+class _PerLoopTransport(httpx.AsyncBaseTransport):
+    def __init__(self, **transport_kwargs: Any):
+        self._transport_kwargs = transport_kwargs
+        # Dropped together with their loop.
+        self._transports = weakref.WeakKeyDictionary()
+
+    def transport_for_running_loop(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        transport = self._transports.get(loop)
+        if transport is None:
+            transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._transport_kwargs)
+        return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self.transport_for_running_loop().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        transport = self._transports.pop(asyncio.get_running_loop(), None)
+        if transport is not None:
+            await transport.aclose()
+
+_http_clients = None
+
+def shared_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    global _http_clients
+    if _http_clients is None:
+        http_client = httpx.Client(http2=_HTTP2, limits=HTTP_LIMITS, timeout=60)
+        atexit.register(http_client.close)
+        transport = _PerLoopTransport(http2=_HTTP2, limits=HTTP_LIMITS)
+        _http_clients = (http_client, httpx.AsyncClient(transport=transport, timeout=60))
+    return _http_clients
+
+def build_openai_llm(model: str = "gpt-4", temperature: float = 0) -> Runnable:
+    from langchain_openai import ChatOpenAI
+
+    http_client, http_async_client = shared_http_clients()
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
@@ -0,0 +1,622 @@
+# Import standard libraries and typing helpers
+from typing import Annotated, Any, AsyncIterator, List, NamedTuple
+from dataclasses import dataclass, field
+from decimal import Decimal
+from itertools import groupby
+import asyncio
+import copy
+import heapq
+import operator
+import re
+
+# Import LangGraph components
+from langgraph.graph import StateGraph, START, END
+# (The add_messages helper is often used to merge list-type state keys.)
+from langgraph.graph.message import add_messages
+from langchain_core.messages import BaseMessage
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+# Helpers shared by the examples in this package.
+from langgraph_examples.common import ResponseCache, cached_prompt, content_hash, structured_llm
+
+# ------------------------------------------------------------------------------
+# Define the state schema for our exchange processing workflow.
+# This state holds:
+#   - file_text: the raw text content extracted from a customer file.
+#   - bank_channels_info: dictionary for bank channel, amount, currency, and beneficiaries.
+#   - modality: the determined operation modality.
+#   - route: the routing key for that modality, set together with it.
+#   - additional_info: modality-specific extracted fields.
+#   - branch_info: raw output of each modality branch that ran, keyed by route.
+#     Branches may run as parallel siblings, so their updates are merged by a
+#     reducer instead of overwriting each other.
+#
+# A slotted dataclass gives the nodes fixed attribute access (state.file_text)
+# instead of dict lookups, and cheaper instances for each step. Nodes only
+# return the fields they changed, so the state is never copied by hand.
+# ------------------------------------------------------------------------------
+def merge_branch_info(left: dict | None, right: dict | None) -> dict:
+    return {**(left or {}), **(right or {})}
+
+@dataclass(slots=True)
+class ExchangeState:
+    file_text: str
+    bank_channels_info: Any = None  # will be a dict once extracted
+    modality: str | None = None
+    route: str | None = None
+    additional_info: Any = None  # modality‐specific info (dict)
+    branch_info: Annotated[dict, merge_branch_info] = field(default_factory=dict)
+
+# ------------------------------------------------------------------------------
+# Output schemas.
+#
+# Each LLM call is bound to one of these via structured_llm(), so answers come
+# back validated instead of as free text. Nodes store them as plain dicts
+# (model_dump()) in the state.
+#
+# The modality is kept as free text rather than a Literal of the three known
+# phrases: an answer outside them must route to "unknown" (see
+# route_for_modality) instead of failing validation and the whole run.
+# ------------------------------------------------------------------------------
+class BankChannelsInfo(BaseModel):
+    channels: str
+    amount: Decimal
+    currency: str
+    beneficiaries: list[str] = []
+
+class ModalityInfo(BaseModel):
+    modality: str
+
+class AdvancePaymentInfo(BaseModel):
+    expected_shipment_date: str
+
+class DeclarationImportInfo(BaseModel):
+    protocol: str
+    declaration_value: Decimal
+
+class ServicesInfo(BaseModel):
+    service_details: str
+
+# ------------------------------------------------------------------------------
+# Simulated LLM.
+#
+# Every node sends its prompt through this runnable, so it can be swapped for a
+# real chat model (e.g. common.build_openai_llm(), ChatAnthropic, ...) without
+# touching the nodes.
+# Being a Runnable it also exposes invoke/batch/ainvoke/abatch for free.
+# The simulation picks a canned answer from the first line of the prompt prefix.
+# ------------------------------------------------------------------------------
+_SIMULATED_RESPONSES = {
+    "bank chanel extraction prompt:": {
+        "channels": "Online Banking, Wire Transfer",
+        "amount": "10000",
+        "currency": "USD",
+        "beneficiaries": ["Beneficiary A", "Beneficiary B"],
+    },
+    "modality prompt:": {"modality": "advance payment"},
+    "advance payment prompt:": {"expected_shipment_date": "2025-04-15"},
+    "declaration import prompt:": {"protocol": "ABC123", "declaration_value": "5000"},
+    "services prompt:": {"service_details": "Maintenance service contract details"},
+    "fused extraction prompt:": {
+        "bank_channels": {
+            "channels": "Online Banking, Wire Transfer",
+            "amount": "10000",
+            "currency": "USD",
+            "beneficiaries": ["Beneficiary A", "Beneficiary B"],
+        },
+        "modality": "advance payment",
+        "additional_info": {"expected_shipment_date": "2025-04-15"},
+    },
+}
+
+def _simulate_llm(prompt: list[BaseMessage]) -> Any:
+    prefix = prompt[0].content[0]["text"]
+    header = prefix.split("\n", 1)[0]
+    response = _SIMULATED_RESPONSES[header]
+    # Hand out a fresh copy so callers can't mutate the canned answer.
+    return copy.deepcopy(response)
+
+llm = RunnableLambda(_simulate_llm)
+
+# The schema-bound runnable for each schema is built once and reused by every
+# call, and rebuilt only if llm has been swapped for another model since.
+_structured_runnables = {}
+
+def structured_for(schema: type[BaseModel]) -> Any:
+    model, runnable = _structured_runnables.get(schema, (None, None))
+    if model is not llm:
+        runnable = structured_llm(llm, schema)
+        _structured_runnables[schema] = (llm, runnable)
+    return runnable
+
+# ------------------------------------------------------------------------------
+# Prompt prefixes.
+#
+# The instruction part of every prompt is constant, so it is built once here and
+# each node only pairs it with the file text instead of re-formatting
+# the whole prompt through an f-string on every call. Prompts are assembled
+# with cached_prompt() so providers with prompt caching reuse the prefix.
+# ------------------------------------------------------------------------------
+PROMPT_PREFIX_BANK = (
+    "bank chanel extraction prompt:\n"
+    "Extract the bank channels, operation amount, currency, and, if applicable, "
+    "split the payment among multiple beneficiaries from the following text:\n"
+)
+PROMPT_PREFIX_MODALITY = (
+    "modality prompt:\n"
+    "Based on the following file text and bank channels info, determine the modality "
+    "of the operation: 'import already arrived', 'advance payment' (import with advance payment), "
+    "or 'service'.\n"
+)
+PROMPT_PREFIX_ADVANCE_PAYMENT = (
+    "advance payment prompt:\n"
+    "From the following text, extract the expected shipment date for the import with advance payment:\n"
+)
+PROMPT_PREFIX_DECLARATION_IMPORT = (
+    "declaration import prompt:\n"
+    "From the following text, extract the declaration details including protocol and value:\n"
+)
+PROMPT_PREFIX_SERVICES = (
+    "services prompt:\n"
+    "From the following text, extract details relevant to the service operation:\n"
+)
+PROMPT_PREFIX_FUSED = (
+    "fused extraction prompt:\n"
+    "From the following text, return a single JSON object with the keys:\n"
+    "  bank_channels: the bank channels, operation amount, currency, and, if applicable, "
+    "the split of the payment among multiple beneficiaries;\n"
+    "  modality: 'import already arrived', 'advance payment', or 'service';\n"
+    "  additional_info: for advance payment the expected shipment date, for an import "
+    "already arrived the declaration protocol and value, for a service the service details.\n"
+)
+
+# ------------------------------------------------------------------------------
+# Extraction answers are deterministic for a given prompt and model, so
+# re-submitted files (retries, eval sweeps) are answered from this LRU instead
+# of the LLM. Answers are keyed by (prefix, schema, text hash), and the cache is
+# emptied whenever llm is swapped for another model.
+# ------------------------------------------------------------------------------
+response_cache = ResponseCache()
+_response_cache_model = None
+_MISSING = object()
+
+def current_response_cache() -> ResponseCache:
+    global _response_cache_model
+    if _response_cache_model is not llm:
+        response_cache.clear()
+        _response_cache_model = llm
+    return response_cache
+
+# ------------------------------------------------------------------------------
+# Shared request scheduler for the extraction and modality nodes.
+#
+# Each of these nodes is a solo LLM call. Under concurrent load (e.g.
+# graph.abatch) many requests reach the same node at nearly the same
+# time, so instead of one call each they are queued here and flushed together.
+# Every request awaits its own future.
+#
+# Pending requests are bucketed by text length (len // bucket_width), so a
+# batch holds prompts of similar size and short ones aren't padded up to the
+# longest. A bucket is flushed once it holds max_batch_size requests, or once
+# its oldest request has waited batch_wait_timeout_s. Each flush runs as its
+# own task, so several batches can be in flight while the worker keeps reading
+# the queue.
+#
+# Identical requests (same cache key) that arrive while one is still on its way
+# to the LLM, as in a retry storm, await that request's future instead of
+# making calls of their own.
+#
+# A flush is handed to dispatch_by_prefix(), which groups the requests by
+# (node, prefix hash) and sends each group as one abatch() call bound to that
+# node's output schema, all groups concurrently. Prefix-caching engines then
+# compute the shared prefix once per group (vLLM: start with
+# --enable-prefix-caching; SGLang's radix cache does it by default).
+# ------------------------------------------------------------------------------
+class PendingRequest(NamedTuple):
+    node_name: str
+    prefix: str
+    text: str
+    schema: type[BaseModel]
+    future: asyncio.Future
+
+# Failures are set on the affected futures only (a bad answer fails just its
+# own request); an exception escaping here would take down the worker and
+# leave every later request hanging.
+async def _dispatch_group(requests: List[PendingRequest]) -> None:
+    try:
+        prompts = [cached_prompt(request.prefix, request.text) for request in requests]
+        responses = await structured_for(requests[0].schema).abatch(prompts, return_exceptions=True)
+        for request, response in zip(requests, responses):
+            if request.future.done():
+                continue
+            if isinstance(response, Exception):
+                request.future.set_exception(response)
+            elif response is None:
+                # with_structured_output() gives None when the model didn't call the tool.
+                request.future.set_exception(ValueError(f"{request.node_name}: no structured output"))
+            else:
+                request.future.set_result(response.model_dump())
+    except Exception as exc:
+        for request in requests:
+            if not request.future.done():
+                request.future.set_exception(exc)
+
+async def dispatch_by_prefix(requests: List[PendingRequest]) -> None:
+    group_key = lambda request: (request.node_name, hash(request.prefix))
+    requests = sorted(requests, key=group_key)
+    await asyncio.gather(*[_dispatch_group(list(group)) for _, group in groupby(requests, key=group_key)])
+
+class PromptScheduler:
+    def __init__(self, max_batch_size: int = 32, batch_wait_timeout_s: float = 0.002, bucket_width: int = 512):
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self.bucket_width = bucket_width
+        self._loop = None
+        self._queue = None
+        self._worker = None
+        self._inflight = {}
+        # Strong references to the in-flight flushes so they aren't garbage
+        # collected before they finish.
+        self._flushes = set()
+
+    async def submit(self, node_name: str, prefix: str, text: str, schema: type[BaseModel]) -> dict:
+        cache = current_response_cache()
+        key = (prefix, schema, content_hash(text))
+        response = cache.get(key, _MISSING)
+        if response is not _MISSING:
+            return response
+
+        loop = asyncio.get_running_loop()
+        # The queue and worker belong to one event loop; start them lazily
+        # (and again if the scheduler is reused from a new asyncio.run()).
+        if self._loop is not loop:
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = None
+            self._inflight = {}
+        # Restart the worker if it died, so queued requests don't wait forever.
+        if self._worker is None or self._worker.done():
+            self._worker = loop.create_task(self._run())
+        future = self._inflight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+            await self._queue.put(PendingRequest(node_name, prefix, text, schema, future))
+        # Shielded, so one cancelled caller doesn't cancel the others' request.
+        response = await asyncio.shield(future)
+        cache.put(key, response)
+        # Every caller gets its own copy of the shared answer.
+        return copy.deepcopy(response)
+
+    def bucket_for(self, text: str) -> int:
+        return len(text) // self.bucket_width
+
+    def _flush(self, requests: List[PendingRequest]) -> None:
+        task = asyncio.get_running_loop().create_task(dispatch_by_prefix(requests))
+        self._flushes.add(task)
+        task.add_done_callback(self._flushes.discard)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # Open buckets as {bucket: (deadline, requests)}, plus a heap of
+        # (deadline, bucket) to find the next one due without scanning them all.
+        buckets = {}
+        deadlines = []
+        while True:
+            timeout = max(0.0, deadlines[0][0] - loop.time()) if deadlines else None
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                request = None
+
+            if request is not None:
+                bucket = self.bucket_for(request.text)
+                if bucket not in buckets:
+                    deadline = loop.time() + self.batch_wait_timeout_s
+                    buckets[bucket] = (deadline, [])
+                    heapq.heappush(deadlines, (deadline, bucket))
+                requests = buckets[bucket][1]
+                requests.append(request)
+                if len(requests) >= self.max_batch_size:
+                    del buckets[bucket]
+                    self._flush(requests)
+
+            now = loop.time()
+            while deadlines and deadlines[0][0] <= now:
+                deadline, bucket = heapq.heappop(deadlines)
+                # Skip entries of buckets that were already flushed when full.
+                if bucket in buckets and buckets[bucket][0] == deadline:
+                    self._flush(buckets.pop(bucket)[1])
+
+scheduler = PromptScheduler()
+
+# ------------------------------------------------------------------------------
+# Node 1: Extract bank channel information.
+#
+# Uses the “bank chanel extraction prompt” (a prompt we assume is defined elsewhere)
+# to extract details such as bank channels, amount, currency, and beneficiaries.
+# ------------------------------------------------------------------------------
+async def extract_bank_channels(state: ExchangeState) -> dict:
+    result = await scheduler.submit("extract_bank_channels", PROMPT_PREFIX_BANK, state.file_text, BankChannelsInfo)
+    return {"bank_channels_info": result}
+
+# ------------------------------------------------------------------------------
+# Node 2: Determine the operation modality.
+#
+# Uses the “modality prompt” to decide if the operation is, for example,
+# "import already arrived", "import with advance payment", or "service".
+# ------------------------------------------------------------------------------
+async def determine_modality(state: ExchangeState) -> dict:
+    text = "".join(["Text: ", state.file_text, f"\nBank Channels: {state.bank_channels_info}\n"])
+    # The simulated LLM answers "advance payment".
+    result = await scheduler.submit("determine_modality", PROMPT_PREFIX_MODALITY, text, ModalityInfo)
+    modality = result["modality"]
+    # Resolve the routing key once here so the router is a plain lookup.
+    return {"modality": modality, "route": route_for_modality(modality)}
+
+# ------------------------------------------------------------------------------
+# Node 3a: If modality is "advance payment", extract additional info (e.g. expected shipment date).
+#
+# Uses the “advance payment prompt.”
+# The branch nodes return their output as a branch_info update under their route key.
+# ------------------------------------------------------------------------------
+async def extract_advance_payment_info(state: ExchangeState) -> dict:
+    info = await scheduler.submit(
+        "extract_advance_payment_info", PROMPT_PREFIX_ADVANCE_PAYMENT, state.file_text, AdvancePaymentInfo
+    )
+    return {"branch_info": {"advance_payment": info}}
+
+# ------------------------------------------------------------------------------
+# Node 3b: If modality is "import already arrived", extract declaration details.
+#
+# Uses the “declaration import prompt.”
+# ------------------------------------------------------------------------------
+async def extract_declaration_import_info(state: ExchangeState) -> dict:
+    info = await scheduler.submit(
+        "extract_declaration_import_info", PROMPT_PREFIX_DECLARATION_IMPORT, state.file_text, DeclarationImportInfo
+    )
+    return {"branch_info": {"declaration_import": info}}
+
+# ------------------------------------------------------------------------------
+# Node 3c: If modality is "service", extract service-related information.
+#
+# Uses the “services prompt.”
+# ------------------------------------------------------------------------------
+async def extract_services_info(state: ExchangeState) -> dict:
+    info = await scheduler.submit("extract_services_info", PROMPT_PREFIX_SERVICES, state.file_text, ServicesInfo)
+    return {"branch_info": {"services": info}}
+
+# ------------------------------------------------------------------------------
+# Map a modality answer to its routing key:
+#   - "advance_payment" if modality is "advance payment"
+#   - "declaration_import" if modality is "import already arrived"
+#   - "services" if modality is "service"
+#   - "unknown" otherwise
+#
+# All modality phrases are compiled into one case-insensitive regex, so the
+# answer is scanned once instead of lowercased and searched per phrase.
+# ------------------------------------------------------------------------------
+MODALITY_ROUTES = {
+    "advance payment": "advance_payment",
+    "import already arrived": "declaration_import",
+    "service": "services",
+}
+_MODALITY_RE = re.compile("|".join(map(re.escape, MODALITY_ROUTES)), re.IGNORECASE)
+
+def route_for_modality(modality: str | None) -> str:
+    match = _MODALITY_RE.search(modality or "")
+    return MODALITY_ROUTES[match.group(0).lower()] if match else "unknown"
+
+# ------------------------------------------------------------------------------
+# Define a conditional function that routes the workflow after modality determination.
+#
+# determine_modality already stored the routing key, so this is a single lookup.
+# ------------------------------------------------------------------------------
+def modality_condition(state: ExchangeState) -> str:
+    return state.route or "unknown"
+
+# ------------------------------------------------------------------------------
+# Join node: pick the branch output that matches the modality.
+#
+# With a single routed branch this is just its output. When the branches ran
+# speculatively in parallel, the other outputs are discarded here but stay
+# available in branch_info.
+# ------------------------------------------------------------------------------
+async def select_branch(state: ExchangeState) -> dict:
+    return {"additional_info": state.branch_info.get(state.route)}
+
+# ------------------------------------------------------------------------------
+# Fused extraction: one LLM call per file instead of one per node.
+#
+# The bank channel, modality and branch prompts each make the LLM read the whole
+# file text again. extract_all() asks for every field in one JSON answer, so the
+# fused nodes below all reuse that single call. It goes through the shared
+# scheduler: the nodes that ask for the same file while the call is in flight
+# await the same future, and later ones are answered from the response cache.
+# ------------------------------------------------------------------------------
+class ExchangeExtraction(BaseModel):
+    bank_channels: BankChannelsInfo
+    modality: str
+    additional_info: AdvancePaymentInfo | DeclarationImportInfo | ServicesInfo
+
+async def extract_all(file_text: str) -> dict:
+    return await scheduler.submit("extract_all", PROMPT_PREFIX_FUSED, file_text, ExchangeExtraction)
+
+async def fused_bank_channels(state: ExchangeState) -> dict:
+    return {"bank_channels_info": (await extract_all(state.file_text))["bank_channels"]}
+
+async def fused_modality(state: ExchangeState) -> dict:
+    modality = (await extract_all(state.file_text))["modality"]
+    return {"modality": modality, "route": route_for_modality(modality)}
+
+async def fused_branch_info(state: ExchangeState) -> dict:
+    extraction = await extract_all(state.file_text)
+    return {"branch_info": {route_for_modality(extraction["modality"]): extraction["additional_info"]}}
+
+# ------------------------------------------------------------------------------
+# Build the LangGraph state graph.
+#
+# The overall flow is:
+#   START → extract_bank_channels → determine_modality
+#   → [conditional branch based on modality]:
+#         if "advance payment": extract_advance_payment_info
+#         if "import already arrived": extract_declaration_import_info
+#         if "service": extract_services_info
+#   → select_branch → END
+#
+# With parallel_branches=True the branches run speculatively instead:
+# extract_bank_channels fans out to determine_modality and all three branches,
+# which LangGraph runs concurrently in the same step, each on its own snapshot
+# of the state. select_branch joins them once all are done and keeps the output
+# matching the modality. The branch latency hides behind the classifier
+# (max(classifier, branch) instead of classifier + branch), at the cost of two
+# extra LLM calls per file; every modality output is also available.
+#
+# With fused=True the graph keeps the same shape, but the extraction nodes are
+# bound to the fused variants that share one extract_all() call per file.
+# ------------------------------------------------------------------------------
+def build_exchange_graph(parallel_branches: bool = False, fused: bool = False) -> Any:
+    # Initialize the state graph with our ExchangeState type.
+    graph_builder = StateGraph(ExchangeState)
+
+    # Add nodes for each step.
+    if fused:
+        graph_builder.add_node("extract_bank_channels", fused_bank_channels)
+        graph_builder.add_node("determine_modality", fused_modality)
+        graph_builder.add_node("extract_advance_payment_info", fused_branch_info)
+        graph_builder.add_node("extract_declaration_import_info", fused_branch_info)
+        graph_builder.add_node("extract_services_info", fused_branch_info)
+    else:
+        graph_builder.add_node("extract_bank_channels", extract_bank_channels)
+        graph_builder.add_node("determine_modality", determine_modality)
+        graph_builder.add_node("extract_advance_payment_info", extract_advance_payment_info)
+        graph_builder.add_node("extract_declaration_import_info", extract_declaration_import_info)
+        graph_builder.add_node("extract_services_info", extract_services_info)
+    graph_builder.add_node("select_branch", select_branch)
+
+    # Set entry point. file_text is expected to be extracted already; if OCR/PDF
+    # extraction is ever needed, add it as a pre-node gated on a missing
+    # file_text so text files keep starting here.
+    graph_builder.set_entry_point("extract_bank_channels")
+
+    branches = [
+        "extract_advance_payment_info",
+        "extract_declaration_import_info",
+        "extract_services_info",
+    ]
+    if parallel_branches:
+        # Fan out to the classifier and every branch; they run as siblings in one step.
+        for node in ["determine_modality", *branches]:
+            graph_builder.add_edge("extract_bank_channels", node)
+        # Joining on the list waits for all siblings before selecting.
+        graph_builder.add_edge(["determine_modality", *branches], "select_branch")
+    else:
+        # Define the linear sequence.
+        graph_builder.add_edge("extract_bank_channels", "determine_modality")
+
+        # Add a conditional edge from 'determine_modality' based on modality_condition.
+        # The path map covers every key the router can return, so each run
+        # resolves its branch with one dict lookup; an unrecognised modality
+        # ends the run without additional_info.
+        graph_builder.add_conditional_edges(
+            "determine_modality",
+            modality_condition,
+            {
+                "advance_payment": "extract_advance_payment_info",
+                "declaration_import": "extract_declaration_import_info",
+                "services": "extract_services_info",
+                "unknown": END,
+            },
+        )
+        for branch in branches:
+            graph_builder.add_edge(branch, "select_branch")
+
+    # The join node ends the run.
+    graph_builder.add_edge("select_branch", END)
+
+    # Compile and return the runnable graph.
+    return graph_builder.compile()
+
+# ------------------------------------------------------------------------------
+# The compiled graph is stateless, so it is built once at import time and
+# reused by every run instead of being rebuilt per request. Callers that want
+# the parallel or fused variant build it once themselves and pass it in.
+#
+# Its nodes are coroutines, so every variant can only be run through the async
+# API: ainvoke, abatch or astream. The sync invoke() and batch() raise a
+# TypeError.
+# ------------------------------------------------------------------------------
+GRAPH = build_exchange_graph()
+
+# ------------------------------------------------------------------------------
+# Run one customer file through the graph.
+#
+# Every node is a coroutine, so the graph has to be run with ainvoke() (sync
+# invoke() raises a TypeError), and while one file waits on the LLM the event
+# loop keeps other files moving; run several at once with
+# asyncio.gather(*[run_exchange(s) for s in states]) or run_exchange_batch().
+# ------------------------------------------------------------------------------
+async def run_exchange(state: ExchangeState, graph: Any = None) -> dict:
+    return await (graph or GRAPH).ainvoke(state)
+
+# ------------------------------------------------------------------------------
+# Stream one customer file through the graph.
+#
+# Yields {node_name: update} as soon as each node finishes, so a consumer can
+# act on bank_channels_info while the modality and branch calls still run
+# instead of waiting for the final state.
+# ------------------------------------------------------------------------------
+async def stream_exchange(state: ExchangeState, graph: Any = None) -> AsyncIterator[dict]:
+    async for update in (graph or GRAPH).astream(state, stream_mode="updates"):
+        yield update
+
+# ------------------------------------------------------------------------------
+# Run a queue of customer files through the graph in one call.
+#
+# graph.abatch() is the Runnable batched interface: the states are processed
+# concurrently (bounded by max_concurrency) instead of one invoke() after the
+# other, so the LLM latency of different files overlaps and the extraction
+# requests of different files get coalesced by the shared scheduler.
+# ------------------------------------------------------------------------------
+async def run_exchange_batch(
+    states: List[ExchangeState], max_concurrency: int = 32, graph: Any = None
+) -> List[dict]:
+    return await (graph or GRAPH).abatch(states, config={"max_concurrency": max_concurrency})
+
+# ------------------------------------------------------------------------------
+# Example usage (python -m langgraph_examples.exchange):
+# Create an initial state with the file text and empty placeholders.
+# In a real system, file_text would be the extracted text from customer files.
+# ------------------------------------------------------------------------------
+def main() -> None:
+    # Sample file text (this text should include details that allow extraction
+    # of bank channel info and hints at the operation modality)
+    sample_text = (
+        "Customer File Content:\n"
+        "The customer has provided a remittance file. The transaction was processed via Online Banking and Wire Transfer. "
+        "The amount of USD 10,000 was remitted to Beneficiary A and Beneficiary B. "
+        "The operation is an import with advance payment; the expected shipment date is 2025-04-15. "
+    )
+
+    # The remaining fields start out empty (see the ExchangeState defaults).
+    initial_states: List[ExchangeState] = [ExchangeState(file_text=sample_text)]
+
+    # Run the precompiled graph over the whole queue of files.
+    final_states = asyncio.run(run_exchange_batch(initial_states))
+
+    # Print the final states.
+    print("Final Exchange Processing State:")
+    for final_state in final_states:
+        print(final_state)
+
+    # Or stream a file and handle each node's output as soon as it is ready.
+    async def print_updates(state: ExchangeState) -> None:
+        async for update in stream_exchange(state):
+            print("Update:", update)
+
+    asyncio.run(print_updates(initial_states[0]))
+
+if __name__ == "__main__":
+    main()
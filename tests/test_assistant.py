@@ -0,0 +1,10 @@
+from langgraph_examples import assistant
+
+def test_reject_keywords_match_case_insensitively():
+    for message in ["a bad answer", "a BAD answer", "Bad answer"]:
+        assert assistant.process_node({"message": message})["answerok"] is False
+    assert assistant.process_node({"message": "a good answer"})["answerok"] is True
+
+def test_rejected_answer_goes_through_the_tool():
+    final_state = assistant.GRAPH.invoke({"user_input": "Tell me a Bad answer."})
+    assert final_state["final_answer"].endswith("[Improved with tool]")
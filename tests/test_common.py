@@ -0,0 +1,71 @@
+import asyncio
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+from pydantic import BaseModel
+
+from langgraph_examples.common import LocalTransformersLLM, ResponseCache, _PerLoopTransport, cached_prompt, structured_llm
+
+def test_cache_hits_are_independent_copies():
+    cache = ResponseCache()
+    response = {"beneficiaries": ["ACME"]}
+    cache.put(("prefix", b"key"), response)
+    response["beneficiaries"].append("put-side change")
+
+    hit = cache.get(("prefix", b"key"))
+    hit["beneficiaries"].append("get-side change")
+
+    assert cache.get(("prefix", b"key")) == {"beneficiaries": ["ACME"]}
+
+def test_cache_evicts_least_recently_used():
+    cache = ResponseCache(maxsize=2)
+    cache.put(("p", b"a"), 1)
+    cache.put(("p", b"b"), 2)
+    cache.get(("p", b"a"))
+    cache.put(("p", b"c"), 3)
+
+    assert cache.get(("p", b"b"), "missing") == "missing"
+    assert cache.get(("p", b"a")) == 1
+
+def test_structured_llm_fallback_asks_for_json_and_parses_it():
+    class Answer(BaseModel):
+        modality: str
+
+    seen = []
+
+    def text_model(prompt):
+        seen.append(prompt[-1].content)
+        return '```json\n{"modality": "service"}\n```'
+
+    answer = structured_llm(RunnableLambda(text_model), Answer).invoke(cached_prompt("prefix", "file text"))
+
+    assert answer == Answer(modality="service")
+    assert seen[0].startswith("file text\n\n")
+    assert '"modality"' in seen[0]
+
+class FailingTokenizer:
+    def apply_chat_template(self, *args, **kwargs):
+        raise RuntimeError("tokenizer failed")
+
+def test_local_llm_batch_honours_return_exceptions():
+    # Skip __init__ so no model is loaded.
+    local = LocalTransformersLLM.__new__(LocalTransformersLLM)
+    local.tokenizer = FailingTokenizer()
+    prompts = [cached_prompt("prefix", "a"), cached_prompt("prefix", "b")]
+
+    results = asyncio.run(local.abatch(prompts, return_exceptions=True))
+    assert [type(result) for result in results] == [RuntimeError, RuntimeError]
+    with pytest.raises(RuntimeError):
+        local.batch(prompts)
+
+def test_async_http_client_keeps_one_pool_per_event_loop():
+    transport = _PerLoopTransport()
+
+    async def current_pool():
+        return transport.transport_for_running_loop(), transport.transport_for_running_loop()
+
+    first, same = asyncio.run(current_pool())
+    second, _ = asyncio.run(current_pool())
+
+    assert first is same
+    assert first is not second
@@ -0,0 +1,233 @@
+import asyncio
+import time
+from decimal import Decimal
+
+import pytest
+from langchain_core.runnables import Runnable
+
+from langgraph_examples import exchange
+from langgraph_examples.exchange import ExchangeState, PromptScheduler, ServicesInfo
+
+# A fake model that records each abatch() call and echoes each prompt's text
+# back. With expected_batches set, every call waits until that many calls have
+# started, so the calls can only all finish if they overlap.
+class EchoLLM(Runnable):
+    def __init__(self, expected_batches: int = 1):
+        self.expected_batches = expected_batches
+        self.all_started = asyncio.Event()
+        self.texts = []
+        self.calls = 0
+
+    def invoke(self, prompt, config=None, **kwargs):
+        self.calls += 1
+        return {"service_details": prompt[-1].content.split("\n\n")[0]}
+
+    async def abatch(self, prompts, config=None, **kwargs):
+        self.texts.append([prompt[-1].content.split("\n\n")[0] for prompt in prompts])
+        if len(self.texts) >= self.expected_batches:
+            self.all_started.set()
+        await asyncio.wait_for(self.all_started.wait(), timeout=5)
+        return [self.invoke(prompt) for prompt in prompts]
+
+def _submit_all(scheduler, texts):
+    async def main():
+        return await asyncio.gather(
+            *[scheduler.submit("extract_services_info", "prefix", text, ServicesInfo) for text in texts]
+        )
+    return asyncio.run(main())
+
+@pytest.fixture
+def fake_llm(monkeypatch):
+    def install(fake):
+        monkeypatch.setattr(exchange, "llm", fake)
+        return fake
+    return install
+
+def test_flushes_overlap(fake_llm):
+    fake = fake_llm(EchoLLM(expected_batches=4))
+    texts = [f"overlap file {i}" for i in range(8)]
+
+    # A long wait timeout, so every batch is flushed because it is full.
+    results = _submit_all(PromptScheduler(max_batch_size=2, batch_wait_timeout_s=5), texts)
+
+    # All four batches were in flight at once; with serial flushes the first
+    # one would wait for the others forever (and time out).
+    assert [len(batch) for batch in fake.texts] == [2, 2, 2, 2]
+    assert [result["service_details"] for result in results] == texts
+
+# A chat model whose structured output is None (the model skipped the tool
+# call) for prompts containing "bad".
+class PartialLLM(EchoLLM):
+    def with_structured_output(self, schema):
+        return self
+
+    def invoke(self, prompt, config=None, **kwargs):
+        if "bad" in prompt[-1].content:
+            return None
+        return ServicesInfo(**super().invoke(prompt))
+
+def test_failed_request_does_not_stall_scheduler(fake_llm):
+    fake_llm(PartialLLM())
+    scheduler = PromptScheduler()
+
+    async def main():
+        return await asyncio.gather(
+            scheduler.submit("extract_services_info", "prefix", "good file", ServicesInfo),
+            scheduler.submit("extract_services_info", "prefix", "bad file", ServicesInfo),
+            return_exceptions=True,
+        )
+
+    good, bad = asyncio.run(main())
+    assert good == {"service_details": "good file"}
+    assert isinstance(bad, Exception)
+    # The worker survives and later requests are still answered.
+    assert _submit_all(scheduler, ["later file"]) == [{"service_details": "later file"}]
+
+def test_concurrent_identical_requests_share_one_call(fake_llm):
+    fake = fake_llm(EchoLLM())
+    results = _submit_all(PromptScheduler(), ["retried file"] * 5)
+
+    assert fake.calls == 1
+    assert results == [{"service_details": "retried file"}] * 5
+    # Each caller got its own copy.
+    results[0]["service_details"] = "changed"
+    assert results[1] == {"service_details": "retried file"}
+
+def test_cache_is_dropped_when_llm_is_swapped(fake_llm):
+    first = fake_llm(EchoLLM())
+    _submit_all(PromptScheduler(), ["swapped model file"])
+    second = fake_llm(EchoLLM())
+    _submit_all(PromptScheduler(), ["swapped model file"])
+
+    assert (first.calls, second.calls) == (1, 1)
+
+def test_bucket_for_groups_by_text_length():
+    scheduler = PromptScheduler(bucket_width=10)
+    assert [scheduler.bucket_for("x" * n) for n in (0, 9, 10, 25)] == [0, 0, 1, 2]
+
+def test_buckets_flush_separately(fake_llm):
+    fake = fake_llm(EchoLLM(expected_batches=2))
+    short = [f"s{i}" for i in range(3)]
+    long = [f"long bucket file {i}" for i in range(3)]
+
+    _submit_all(PromptScheduler(max_batch_size=3, batch_wait_timeout_s=5, bucket_width=10), short + long)
+
+    assert sorted(fake.texts) == [long, short]
+
+def test_partial_bucket_flushes_at_deadline(fake_llm):
+    fake = fake_llm(EchoLLM())
+    scheduler = PromptScheduler(max_batch_size=32, batch_wait_timeout_s=0.1)
+
+    started = time.monotonic()
+    _submit_all(scheduler, ["lonely deadline file"])
+
+    # Never full, so it went out only once the deadline passed.
+    assert fake.texts == [["lonely deadline file"]]
+    assert time.monotonic() - started >= 0.1
+
+def test_determine_modality_goes_through_scheduler(monkeypatch):
+    submitted = []
+
+    async def submit(node_name, prefix, text, schema):
+        submitted.append((node_name, schema))
+        return {"modality": "Service"}
+
+    monkeypatch.setattr(exchange.scheduler, "submit", submit)
+    state = ExchangeState(file_text="modality file")
+
+    assert asyncio.run(exchange.determine_modality(state)) == {"modality": "Service", "route": "services"}
+    assert submitted == [("determine_modality", exchange.ModalityInfo)]
+
+def test_unknown_modality_routes_to_unknown(monkeypatch):
+    responses = dict(exchange._SIMULATED_RESPONSES, **{"modality prompt:": {"modality": "something else"}})
+    monkeypatch.setattr(exchange, "_SIMULATED_RESPONSES", responses)
+    monkeypatch.setattr(exchange, "llm", exchange.RunnableLambda(exchange._simulate_llm))
+    state = ExchangeState(file_text="unknown modality file")
+
+    # The answer passes schema validation and falls through to the "unknown" route.
+    update = asyncio.run(exchange.determine_modality(state))
+    assert update == {"modality": "something else", "route": "unknown"}
+
+def test_unknown_modality_ends_the_run(monkeypatch):
+    responses = dict(exchange._SIMULATED_RESPONSES, **{"modality prompt:": {"modality": "something else"}})
+    monkeypatch.setattr(exchange, "_SIMULATED_RESPONSES", responses)
+    monkeypatch.setattr(exchange, "llm", exchange.RunnableLambda(exchange._simulate_llm))
+
+    final_state = asyncio.run(exchange.run_exchange(ExchangeState(file_text="unknown modality file")))
+
+    assert final_state["modality"] == "something else"
+    assert final_state["route"] == "unknown"
+    assert final_state.get("additional_info") is None
+    assert final_state["branch_info"] == {}
+
+def test_parallel_branches_run_speculatively():
+    graph = exchange.build_exchange_graph(parallel_branches=True)
+    final_state = asyncio.run(exchange.run_exchange(ExchangeState(file_text="parallel file"), graph))
+
+    # All three branches ran and the reducer kept every output.
+    assert set(final_state["branch_info"]) == {"advance_payment", "declaration_import", "services"}
+    # select_branch kept the one matching the modality.
+    assert final_state["route"] == "advance_payment"
+    assert final_state["additional_info"] == final_state["branch_info"]["advance_payment"]
+
+def test_select_branch_picks_by_route():
+    state = ExchangeState(
+        file_text="select file",
+        route="services",
+        branch_info={"advance_payment": {"expected_shipment_date": "2025-04-15"}, "services": {"service_details": "x"}},
+    )
+    assert asyncio.run(exchange.select_branch(state)) == {"additional_info": {"service_details": "x"}}
+
+def test_fused_graph_matches_routed_graph():
+    state = ExchangeState(file_text="fused file")
+    routed = asyncio.run(exchange.run_exchange(state))
+    fused = asyncio.run(exchange.run_exchange(state, exchange.build_exchange_graph(fused=True)))
+
+    assert fused["additional_info"] == routed["additional_info"]
+    assert fused["bank_channels_info"] == routed["bank_channels_info"]
+    assert fused["bank_channels_info"]["amount"] == Decimal("10000")
+
+# Answers every prompt with the simulated fused extraction, counting calls.
+class FusedLLM(EchoLLM):
+    def invoke(self, prompt, config=None, **kwargs):
+        self.calls += 1
+        return exchange._simulate_llm(prompt)
+
+def test_fused_nodes_share_one_call_per_file(fake_llm):
+    fake = fake_llm(FusedLLM())
+    graph = exchange.build_exchange_graph(fused=True)
+    state = ExchangeState(file_text="fused single call file")
+
+    first = asyncio.run(exchange.run_exchange(state, graph))
+    first["additional_info"]["expected_shipment_date"] = "changed"
+    second = asyncio.run(exchange.run_exchange(state, graph))
+
+    assert fake.calls == 1
+    assert second["additional_info"] == {"expected_shipment_date": "2025-04-15"}
+
+def test_structured_runnable_is_reused_until_llm_changes(fake_llm):
+    first = exchange.structured_for(ServicesInfo)
+    assert exchange.structured_for(ServicesInfo) is first
+
+    fake_llm(EchoLLM())
+    assert exchange.structured_for(ServicesInfo) is not first
+
+def test_stream_yields_updates_in_node_order():
+    async def collect():
+        return [update async for update in exchange.stream_exchange(ExchangeState(file_text="stream file"))]
+
+    updates = asyncio.run(collect())
+
+    assert [next(iter(update)) for update in updates] == [
+        "extract_bank_channels",
+        "determine_modality",
+        "extract_advance_payment_info",
+        "select_branch",
+    ]
+    assert updates[0]["extract_bank_channels"]["bank_channels_info"]["currency"] == "USD"
+
+def test_graph_is_async_only():
+    state = ExchangeState(file_text="async only file")
+    with pytest.raises(TypeError):
+        exchange.GRAPH.invoke(state)
+    assert asyncio.run(exchange.run_exchange(state))["route"] == "advance_payment"